@@ -1,26 +1,313 @@
-import json
+from __future__ import annotations
+
+import asyncio
+import errno
+import fnmatch
+import functools
+import glob
 import logging
+import os
 import re
-from datetime import datetime
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from git import Repo
-from git.exc import GitCommandError
+import orjson
 from mcp.server import Server
 from mcp.types import EmbeddedResource, ImageContent, Resource, TextContent, Tool
 from pydantic import AnyUrl
 
+# GitPythonとpygit2は読み込みに時間がかかるため、起動時ではなく初回利用時にインポートする
+if TYPE_CHECKING:
+    from git import Repo
+
 # ログの準備
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("git-server")
 
+_URI_SCHEME = "git"
+_URI_PREFIX = f"{_URI_SCHEME}://"
+
+# レスポンスをインデントせずに返すツール
+_COMPACT_TOOLS = frozenset({"git_diff"})
+
+# これより多いファイル数のgit_addは一度のgit呼び出しでまとめてステージングする
+_BATCH_ADD_THRESHOLD = 16
+
+# リポジトリ名のバリデーション用（呼び出しごとに生成しないようにする）
+_VALID_NAME_RE = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9-_.]*\Z")
+# 禁止文字列は一つの正規表現にまとめ、一回の走査で判定する
+_FORBIDDEN_RE = re.compile("|".join(map(re.escape, ("..", "//", "\\\\", ".git", ".lock"))))
+_RESERVED_NAMES = frozenset(
+    {
+        "git",
+        "temp",
+        "tmp",
+        "aux",
+        "con",
+        "prn",
+        "nul",
+        "com1",
+        "com2",
+        "com3",
+        "com4",
+        "lpt1",
+        "lpt2",
+        "lpt3",
+    }
+)
+
+# 開いたままにしておくRepoオブジェクトの上限
+_REPO_CACHE_SIZE = 32
+
+# 存在を確認済みのリポジトリを再確認せずに扱う期間（秒）
+_KNOWN_REPO_TTL = 30.0
+
+
+def _dump(obj: Any, indent: bool = True) -> str:
+    """レスポンス用のJSON文字列を生成する（indent=Falseで改行・インデントなしの出力）"""
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, option=option).decode()
+
+
+def _text(obj: Any, indent: bool = True) -> TextContent:
+    """JSONレスポンスをTextContentとして包む"""
+    return TextContent(type="text", text=_dump(obj, indent))
+
+
+@functools.lru_cache(maxsize=1024)
+def _git_uri(repo_name: str) -> AnyUrl:
+    """リポジトリのURIを生成する（URLの解析は名前ごとに一度だけ行う）"""
+    return AnyUrl(f"{_URI_PREFIX}{repo_name}")
+
+
+def _is_git_repository(path: str) -> bool:
+    """通常のリポジトリ（.git を持つ）またはベアリポジトリかどうかを判定する"""
+    if os.path.exists(os.path.join(path, ".git")):
+        return True
+    # ベアリポジトリはディレクトリ自体がgitディレクトリ
+    return os.path.isfile(os.path.join(path, "HEAD")) and os.path.isdir(
+        os.path.join(path, "objects")
+    )
+
+
+def _required_arg(arguments: dict[str, Any], key: str) -> Any:
+    """
+    必須の引数を取得する
+
+    Args:
+        arguments (dict[str, Any]): ツールの引数
+        key (str): 引数名
+
+    Returns:
+        Any: 引数の値
+
+    Raises:
+        ValueError: 引数が指定されていない場合
+    """
+    try:
+        return arguments[key]
+    except KeyError:
+        raise ValueError(f"Missing required argument: {key}") from None
+
+
+def _batch_error(
+    index: int, op_name: str, error: str, results: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    git_batch の失敗時のレスポンスを生成する
+
+    Args:
+        index (int): 失敗した操作の位置
+        op_name (str): 失敗した操作のツール名
+        error (str): エラーメッセージ
+        results (list[dict[str, Any]]): 完了済みの操作の結果
+
+    Returns:
+        dict[str, Any]: エラーレスポンス
+    """
+    return {
+        "status": "error",
+        "failed_op": index,
+        "op": op_name,
+        "error": error,
+        "results": results,
+    }
+
+
+# ツール定義は静的なのでインポート時に一度だけ生成する
+_TOOLS: list[Tool] = [
+    Tool(
+        name="create_repository",
+        description="Create a new git repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Repository name",
+                },
+                "init_commit": {
+                    "type": "boolean",
+                    "description": "Create initial commit",
+                    "default": True,
+                },
+                "remote_url": {
+                    "type": "string",
+                    "description": "Remote repository URL (optional)",
+                },
+                "bare": {
+                    "type": "boolean",
+                    "description": "Create a bare repository without a working tree",
+                    "default": False,
+                },
+            },
+            "required": ["name"],
+        },
+    ),
+    Tool(
+        name="git_add",
+        description="Add files to git staging area",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_name": {"type": "string", "description": "Repository name"},
+                "files": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of files to add (duplicate paths are staged once)",
+                },
+            },
+            "required": ["repo_name", "files"],
+        },
+    ),
+    Tool(
+        name="git_commit",
+        description="Commit staged changes",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_name": {"type": "string", "description": "Repository name"},
+                "message": {"type": "string", "description": "Commit message"},
+            },
+            "required": ["repo_name", "message"],
+        },
+    ),
+    Tool(
+        name="git_pull",
+        description="Pull changes from remote repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_name": {"type": "string", "description": "Repository name"},
+                "remote": {
+                    "type": "string",
+                    "description": "Remote name",
+                    "default": "origin",
+                },
+                "branch": {
+                    "type": "string",
+                    "description": "Branch name",
+                    "default": "main",
+                },
+            },
+            "required": ["repo_name"],
+        },
+    ),
+    Tool(
+        name="git_push",
+        description="Push changes to remote repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_name": {"type": "string", "description": "Repository name"},
+                "remote": {
+                    "type": "string",
+                    "description": "Remote name",
+                    "default": "origin",
+                },
+                "branch": {
+                    "type": "string",
+                    "description": "Branch name",
+                    "default": "main",
+                },
+            },
+            "required": ["repo_name"],
+        },
+    ),
+    Tool(
+        name="git_diff",
+        description="Show differences between commits, commit and working tree, etc.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_name": {"type": "string", "description": "Repository name"},
+                "commit1": {
+                    "type": "string",
+                    "description": "First commit hash (optional, default is HEAD)",
+                    "default": "HEAD",
+                },
+                "commit2": {
+                    "type": "string",
+                    "description": "Second commit hash (optional)",
+                },
+            },
+            "required": ["repo_name"],
+        },
+    ),
+    Tool(
+        name="git_batch",
+        description="Run several tool operations in order with a single request",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "repo_name": {
+                    "type": "string",
+                    "description": "Default repository name for operations that omit it (optional)",
+                },
+                "ops": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "op": {"type": "string", "description": "Tool name"},
+                            "args": {"type": "object", "description": "Tool arguments"},
+                        },
+                        "required": ["op"],
+                    },
+                    "description": (
+                        "Operations to run; execution stops at the first failure and "
+                        "the results of the completed operations are returned"
+                    ),
+                },
+            },
+            "required": ["ops"],
+        },
+    ),
+]
+
+# git_batch 内の各操作の引数検証に使う
+_TOOL_SCHEMAS: dict[str, dict[str, Any]] = {tool.name: tool.inputSchema for tool in _TOOLS}
+
 
 class GitServer:
     def __init__(self, repositories_dir: str = "./repositories"):
         self.repositories_dir = Path(repositories_dir)
         self.repositories_dir.mkdir(parents=True, exist_ok=True)
+        # リクエストごとのパス組み立てはPathではなく文字列で行う
+        self._repositories_dir_str = str(self.repositories_dir)
         self.app = Server("git-server")
+        self._repo_cache: OrderedDict[Path, tuple[int, Repo]] = OrderedDict()
+        self._known_repos: dict[str, tuple[float, Path]] = {}
+        self._repo_locks: dict[Path, asyncio.Lock] = {}
         self._setup_routes()
 
     def _validate_repo_name(self, repo_name: str) -> None:
@@ -40,42 +327,24 @@ class GitServer:
         if len(repo_name) > 255:
             raise ValueError("Repository name is too long (max 255 characters)")
 
+        # パスインジェクション対策（".." は禁止文字列のチェックで弾かれる）
+        if "/" in repo_name or "\\" in repo_name:
+            raise ValueError("Repository name cannot contain path traversal characters")
+
         # 基本的な文字のバリデーション
-        if not re.match(r"^[a-zA-Z0-9][a-zA-Z0-9-_.]*$", repo_name):
+        if _VALID_NAME_RE.match(repo_name) is None:
             raise ValueError(
                 "Repository name must start with alphanumeric character and can only contain alphanumeric characters, hyphens, underscores, and dots"
             )
 
         # 危険な文字列のチェック
-        forbidden_patterns = ["..", "//", "\\\\", ".git", ".lock"]
-        if any(pattern in repo_name for pattern in forbidden_patterns):
+        if _FORBIDDEN_RE.search(repo_name):
             raise ValueError(f"Repository name contains forbidden pattern: {repo_name}")
 
         # 予約された名前のチェック
-        reserved_names = [
-            "git",
-            "temp",
-            "tmp",
-            "aux",
-            "con",
-            "prn",
-            "nul",
-            "com1",
-            "com2",
-            "com3",
-            "com4",
-            "lpt1",
-            "lpt2",
-            "lpt3",
-        ]
-        if repo_name.lower() in reserved_names:
+        if repo_name.lower() in _RESERVED_NAMES:
             raise ValueError(f"Repository name '{repo_name}' is reserved and cannot be used")
 
-        # パスインジェクション対策
-        repo_path = Path(repo_name)
-        if ".." in repo_path.parts or "/" in repo_name or "\\" in repo_name:
-            raise ValueError("Repository name cannot contain path traversal characters")
-
     def _check_repository_exists(self, repo_name: str) -> Path:
         """
         リポジトリの存在確認を行う
@@ -89,343 +358,578 @@ class GitServer:
         Raises:
             ValueError: リポジトリが存在しない場合
         """
+        known = self._known_repos.get(repo_name)
+        if known is not None and known[0] > time.monotonic():
+            return known[1]
+
         self._validate_repo_name(repo_name)
-        repo_path = self.repositories_dir / repo_name
-        if not repo_path.exists() or not (repo_path / ".git").exists():
-            raise ValueError(f"Repository not found: {repo_name}")
+        repo_dir = os.path.join(self._repositories_dir_str, repo_name)
+        # 通常のリポジトリは .git/HEAD への一回のstatで確認し、
+        # それ以外（ベアリポジトリなど）の場合のみ詳しく調べる
+        try:
+            os.stat(os.path.join(repo_dir, ".git", "HEAD"))
+        except OSError:
+            if not _is_git_repository(repo_dir):
+                raise ValueError(f"Repository not found: {repo_name}")
+        repo_path = Path(repo_dir)
+        self._remember_repository(repo_name, repo_path)
         return repo_path
 
+    def _remember_repository(self, repo_name: str, repo_path: Path) -> None:
+        """
+        存在を確認済みのリポジトリを一定時間キャッシュする
+
+        Args:
+            repo_name (str): 検証済みのリポジトリ名
+            repo_path (Path): リポジトリのパス
+        """
+        self._known_repos[repo_name] = (time.monotonic() + _KNOWN_REPO_TTL, repo_path)
+
+    def _repo_lock(self, repo_path: Path) -> asyncio.Lock:
+        """
+        リポジトリごとのロックを取得する
+
+        Git操作はスレッドで実行されるため、同じリポジトリ（共有のRepoとインデックス）への
+        操作はこのロックを保持して一つずつ行う
+
+        Args:
+            repo_path (Path): リポジトリのパス
+
+        Returns:
+            asyncio.Lock: リポジトリに対応するロック
+        """
+        lock = self._repo_locks.get(repo_path)
+        if lock is None:
+            lock = self._repo_locks[repo_path] = asyncio.Lock()
+        return lock
+
+    def _get_repo(self, repo_path: Path) -> Repo:
+        """
+        キャッシュ済みのRepoオブジェクトを取得する
+
+        HEAD の更新時刻が変わっていなければキャッシュを再利用する。
+        キャッシュは最近使われた順に _REPO_CACHE_SIZE 件まで保持する。
+        呼び出し側は repo_path のロックを保持していること
+
+        Args:
+            repo_path (Path): リポジトリのパス
+
+        Returns:
+            Repo: リポジトリオブジェクト
+
+        Raises:
+            ValueError: リポジトリが削除されていた場合
+        """
+        try:
+            head_mtime = os.stat(os.path.join(repo_path, ".git", "HEAD")).st_mtime_ns
+        except FileNotFoundError:
+            try:
+                # ベアリポジトリ
+                head_mtime = os.stat(os.path.join(repo_path, "HEAD")).st_mtime_ns
+            except FileNotFoundError:
+                # 存在確認のキャッシュ後に削除された場合は、キャッシュを破棄して見つからない扱いにする
+                self._known_repos.pop(repo_path.name, None)
+                cached = self._repo_cache.pop(repo_path, None)
+                if cached is not None:
+                    cached[1].close()
+                raise ValueError(f"Repository not found: {repo_path.name}") from None
+        cached = self._repo_cache.get(repo_path)
+        if cached is not None:
+            mtime, repo = cached
+            if mtime == head_mtime:
+                self._repo_cache.move_to_end(repo_path)
+                return repo
+            repo.close()
+
+        from git import Repo
+
+        repo = Repo(repo_path)
+        self._repo_cache[repo_path] = (head_mtime, repo)
+        self._repo_cache.move_to_end(repo_path)
+        if len(self._repo_cache) > _REPO_CACHE_SIZE:
+            evicted_path, (_, evicted) = self._repo_cache.popitem(last=False)
+            # 他のリクエストが使用中のRepoは閉じず、参照がなくなった時点での解放に任せる
+            evicted_lock = self._repo_locks.get(evicted_path)
+            if evicted_lock is None or not evicted_lock.locked():
+                evicted.close()
+        return repo
+
+    def _diff(self, repo: Repo, *revisions: str) -> str:
+        """
+        git diff の出力を取得する（ブロッキング処理のためスレッドから呼び出す）
+
+        Args:
+            repo (Repo): 対象のリポジトリ
+            *revisions (str): 比較するコミット
+
+        Returns:
+            str: 差分のテキスト
+
+        Raises:
+            ValueError: コミットの指定が "-" で始まる場合
+        """
+        # クライアントの値がgitのオプションとして解釈されないようにする
+        for revision in revisions:
+            if revision.startswith("-"):
+                raise ValueError(f"Invalid revision: {revision}")
+
+        # 出力を一括でバッファリングせず、パイプから逐次バッファへ書き込む
+        buf = BytesIO()
+        repo.git.diff("--no-color", *revisions, "--", output_stream=buf)
+        # GitPythonの通常の出力に合わせて末尾の改行を一つ取り除く
+        return buf.getvalue().decode("utf-8", errors="replace").removesuffix("\n")
+
+    def _resource_filters(self) -> tuple[str, str | None]:
+        """
+        list_resources の絞り込み条件をリクエストの _meta から取得する
+
+        Returns:
+            tuple[str, str | None]: リポジトリ名の接頭辞と、globパターン（指定がなければNone）
+
+        Raises:
+            ValueError: 絞り込み条件が文字列でない場合
+        """
+        try:
+            meta = self.app.request_context.meta
+        except LookupError:
+            meta = None
+        prefix = getattr(meta, "prefix", None) or ""
+        pattern = getattr(meta, "pattern", None)
+        if not isinstance(prefix, str) or not (pattern is None or isinstance(pattern, str)):
+            raise ValueError("Resource filters 'prefix' and 'pattern' must be strings")
+        return prefix, pattern
+
+    def _scan_repo_dirs(self, prefix: str, pattern: str | None) -> list[os.DirEntry]:
+        """
+        リポジトリ候補のディレクトリを列挙する
+
+        Args:
+            prefix (str): リポジトリ名の接頭辞
+            pattern (str | None): リポジトリ名のglobパターン
+
+        Returns:
+            list[os.DirEntry]: 条件に一致するディレクトリエントリ
+        """
+        # 名前による絞り込みは、ファイルシステムを確認する前に済ませる
+        with os.scandir(self.repositories_dir) as it:
+            return [
+                entry
+                for entry in it
+                if entry.name.startswith(prefix)
+                and (pattern is None or fnmatch.fnmatchcase(entry.name, pattern))
+                and entry.is_dir(follow_symlinks=False)
+            ]
+
+    def _list_repo_resources(self, prefix: str, pattern: str | None) -> list[Resource]:
+        """
+        リポジトリを列挙してリソース情報を生成する（ブロッキング処理のためスレッドから呼び出す）
+
+        走査と各リポジトリの確認はstat数回で済むため、エントリごとにスレッドへ渡さず一度に行う
+
+        Args:
+            prefix (str): リポジトリ名の接頭辞
+            pattern (str | None): リポジトリ名のglobパターン
+
+        Returns:
+            list[Resource]: リポジトリと確認できたエントリのリソース情報
+        """
+        entries = self._scan_repo_dirs(prefix, pattern)
+        return [resource for resource in map(self._load_repo_meta, entries) if resource is not None]
+
+    def _load_repo_meta(self, entry: os.DirEntry) -> Resource | None:
+        """
+        ディレクトリエントリからリソース情報を生成する
+
+        Args:
+            entry (os.DirEntry): リポジトリ候補のディレクトリエントリ
+
+        Returns:
+            Resource | None: リポジトリでない、または名前が無効な場合はNone
+        """
+        if not _is_git_repository(entry.path):
+            return None
+        # 一覧に出したリソースが read_resource で必ず読めるよう、_validate_repo_name と同じ規則で確認する
+        # （"/" と長さはファイルシステム上の名前では問題にならないため省く。
+        #   完全な検証を経ていないので、既知リポジトリのキャッシュには登録しない）
+        name = entry.name
+        if (
+            _VALID_NAME_RE.match(name) is None
+            or _FORBIDDEN_RE.search(name)
+            or name.lower() in _RESERVED_NAMES
+        ):
+            logger.warning(f"Skipping repository with invalid name: {name!r}")
+            return None
+        return Resource(
+            uri=_git_uri(name),
+            name=f"Git repository dir: {os.path.abspath(entry.path)}",
+            mimeType="application/x-git",
+            description=f"Local git repository at {entry.path}",
+        )
+
+    def _init_repository(
+        self,
+        repo_path: Path,
+        repo_name: str,
+        init_commit: bool,
+        bare: bool,
+        remote_url: str | None,
+    ) -> None:
+        """
+        リポジトリを初期化する（ブロッキング処理のためスレッドから呼び出す）
+
+        Args:
+            repo_path (Path): 作成するリポジトリのパス
+            repo_name (str): リポジトリ名
+            init_commit (bool): 初期コミットを作成するかどうか
+            bare (bool): ベアリポジトリとして作成するかどうか
+            remote_url (str | None): originとして登録するリモートURL
+        """
+        from git import IndexFile, Repo
+        from git.index.typ import BaseIndexEntry, IndexEntry
+        from git.objects import Commit
+        from gitdb import IStream
+
+        # 一時的に開くだけなので、常駐gitプロセスを残さないよう閉じる
+        # git_pull/git_push の既定ブランチに合わせて main で初期化する
+        with Repo.init(repo_path, bare=bare, initial_branch="main") as repo:
+            # リモートは初期コミットより前に登録し、設定の書き込みをまとめる
+            if remote_url:
+                repo.create_remote("origin", remote_url)
+
+            created_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+            data = f"# {repo_name}\n\nCreated on {created_at}".encode()
+
+            if init_commit and bare:
+                # ワーキングツリーを経由せずにオブジェクトDBへ直接書き込む
+                istream = repo.odb.store(IStream("blob", len(data), BytesIO(data)))
+                index = IndexFile(repo)
+                entry = BaseIndexEntry((0o100644, istream.binsha, 0, "README.md"))
+                index.entries[index.entry_key(entry)] = IndexEntry.from_base(entry)
+                Commit.create_from_tree(repo, index.write_tree(), "Initial commit", head=True)
+            elif init_commit:
+                # Create README.md
+                readme_path = repo_path / "README.md"
+                readme_path.write_bytes(data)
+
+                # Initial commit
+                repo.index.add(["README.md"])
+                repo.index.commit("Initial commit")
+
+    def _stage_files(self, repo: Repo, files: list[str]) -> None:
+        """
+        ファイルをステージングエリアに追加する（ブロッキング処理のためスレッドから呼び出す）
+
+        Args:
+            repo (Repo): 対象のリポジトリ
+            files (list[str]): 追加するファイルのリスト
+
+        Raises:
+            FileNotFoundError: 存在しないパス（削除済みの追跡ファイルを含む）が指定された場合
+        """
+        if len(files) <= _BATCH_ADD_THRESHOLD:
+            repo.index.add(files)
+            return
+
+        # index.add と同じ結果になるよう、存在しないパスは実行前に拒否する
+        # （index.add と同様にglobパターンも受け付ける）
+        for f in files:
+            if not glob.glob(f, root_dir=repo.working_tree_dir):
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), f)
+
+        # パスをNUL区切りで標準入力から渡し、git add を一回だけ起動する
+        # index.add は .gitignore を参照しないため、--force で無視対象のファイルも追加する
+        with tempfile.TemporaryFile() as pathspec:
+            pathspec.write(b"\0".join(os.fsencode(f) for f in files))
+            pathspec.seek(0)
+            repo.git.add(
+                "--force", "--pathspec-from-file=-", "--pathspec-file-nul", istream=pathspec
+            )
+
+    def _sync_remote(self, repo: Repo, command: str, remote: str, branch: str) -> None:
+        """
+        git pull / git push を実行する（ブロッキング処理のためスレッドから呼び出す）
+
+        Args:
+            repo (Repo): 対象のリポジトリ
+            command (str): "pull" または "push"
+            remote (str): リモート名
+            branch (str): ブランチ名
+
+        Raises:
+            ValueError: リモートが登録されていない、またはブランチ名が "-" で始まる場合
+        """
+        # クライアントの値がgitのオプションとして解釈されないよう、
+        # 登録済みのリモート名のみを受け付け、位置引数の前に "--" を置く
+        if remote not in (r.name for r in repo.remotes):
+            raise ValueError(f"Remote not found: {remote}")
+        if branch.startswith("-"):
+            raise ValueError(f"Invalid branch name: {branch}")
+        getattr(repo.git, command)("--", remote, branch)
+
+    async def _run_batch(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """
+        git_batch の各操作を先頭から順に実行する
+
+        MCPはトップレベルの引数しかスキーマ検証しないため、各操作の引数は実行前にまとめて検証する。
+        失敗した操作があればそこで中断し、それまでの結果と失敗した操作の位置を返す
+
+        Args:
+            arguments (dict[str, Any]): git_batch の引数
+
+        Returns:
+            dict[str, Any]: 各操作の実行結果
+        """
+        import jsonschema
+
+        default_repo = arguments.get("repo_name")
+        ops = []
+        for i, op in enumerate(_required_arg(arguments, "ops")):
+            op_name = _required_arg(op, "op")
+            op_args = dict(op.get("args", {}))
+            if default_repo is not None and op_name != "create_repository":
+                op_args.setdefault("repo_name", default_repo)
+            if op_name == "git_batch":
+                return _batch_error(i, op_name, "git_batch cannot be nested", [])
+            if op_name not in _TOOL_SCHEMAS:
+                return _batch_error(i, op_name, f"Unknown tool: {op_name}", [])
+            try:
+                jsonschema.validate(op_args, _TOOL_SCHEMAS[op_name])
+            except jsonschema.ValidationError as e:
+                return _batch_error(i, op_name, f"Invalid arguments: {e.message}", [])
+            ops.append((op_name, op_args))
+
+        results = []
+        for i, (op_name, op_args) in enumerate(ops):
+            try:
+                result = await self._dispatch_tool(op_name, op_args)
+            except Exception as e:
+                logger.error(f"Batch operation {i} ({op_name}) failed: {str(e)}")
+                return _batch_error(i, op_name, str(e), results)
+            results.append({"op": op_name, "result": result})
+        return {"status": "success", "results": results}
+
+    async def _dispatch_tool(self, name: str, arguments: Any) -> dict[str, Any]:
+        """
+        ツールを実行し、レスポンスとなる辞書を返す
+
+        Args:
+            name (str): ツール名
+            arguments (Any): ツールの引数
+
+        Returns:
+            dict[str, Any]: ツールの実行結果
+        """
+        if name == "git_batch":
+            return await self._run_batch(arguments)
+
+        if name == "create_repository":
+            if not isinstance(arguments, dict) or "name" not in arguments:
+                raise ValueError("Invalid repository creation arguments")
+
+            repo_name = arguments["name"]
+            self._validate_repo_name(repo_name)
+            repo_path = self.repositories_dir / repo_name
+
+            if repo_path.exists():
+                raise ValueError(f"Repository already exists: {repo_name}")
+
+            init_commit = arguments.get("init_commit", True)
+            remote_url = arguments.get("remote_url")
+            bare = arguments.get("bare", False)
+
+            # 作成中のリポジトリに他の操作が割り込まないようにする
+            async with self._repo_lock(repo_path):
+                repo_path.mkdir(parents=True)
+                try:
+                    await asyncio.to_thread(
+                        self._init_repository,
+                        repo_path,
+                        repo_name,
+                        init_commit,
+                        bare,
+                        remote_url,
+                    )
+                except Exception:
+                    # 作成途中のリポジトリを残さない
+                    self._known_repos.pop(repo_name, None)
+                    await asyncio.to_thread(shutil.rmtree, repo_path, ignore_errors=True)
+                    raise
+                self._remember_repository(repo_name, repo_path)
+
+            return {
+                "status": "success",
+                "message": f"Repository '{repo_name}' created successfully",
+                "path": str(repo_path.absolute()),
+                "has_initial_commit": init_commit,
+                "bare": bare,
+                "remote_url": remote_url,
+            }
+
+        # その他のGit操作の共通処理
+        repo_name = _required_arg(arguments, "repo_name")
+        repo_path = self._check_repository_exists(repo_name)
+        # 同じリポジトリへの操作は一つずつ実行する
+        async with self._repo_lock(repo_path):
+            repo = self._get_repo(repo_path)
+
+            # ベアリポジトリにはインデックスがないため、ステージングとコミットは行えない
+            if name in ("git_add", "git_commit") and repo.bare:
+                raise ValueError(f"Cannot run {name} on bare repository: {repo_name}")
+
+            if name == "git_add":
+                # 同じパスの重複指定は一つにまとめる（順序は保持する）
+                files = list(dict.fromkeys(_required_arg(arguments, "files")))
+                await asyncio.to_thread(self._stage_files, repo, files)
+                return {
+                    "status": "success",
+                    "message": f"Added files to staging area: {', '.join(files)}",
+                    "repo": repo_name,
+                }
+
+            elif name == "git_commit":
+                message = _required_arg(arguments, "message")
+                commit = await asyncio.to_thread(repo.index.commit, message)
+                return {
+                    "status": "success",
+                    "message": "Commit created successfully",
+                    "commit_hash": str(commit),
+                    "commit_message": message,
+                    "repo": repo_name,
+                }
+
+            elif name == "git_pull":
+                remote = arguments.get("remote", "origin")
+                branch = arguments.get("branch", "main")
+                await asyncio.to_thread(self._sync_remote, repo, "pull", remote, branch)
+                return {
+                    "status": "success",
+                    "message": f"Pulled changes from {remote}/{branch}",
+                    "repo": repo_name,
+                }
+
+            elif name == "git_push":
+                remote = arguments.get("remote", "origin")
+                branch = arguments.get("branch", "main")
+                await asyncio.to_thread(self._sync_remote, repo, "push", remote, branch)
+                return {
+                    "status": "success",
+                    "message": f"Pushed changes to {remote}/{branch}",
+                    "repo": repo_name,
+                }
+
+            elif name == "git_diff":
+                commit1 = arguments.get("commit1", "HEAD")
+                commit2 = arguments.get("commit2")
+
+                # diffコマンドの実行
+                if commit2:
+                    diff_result = await asyncio.to_thread(self._diff, repo, commit1, commit2)
+                else:
+                    # コミット済みの変更とワーキングツリーの差分を表示
+                    diff_result = await asyncio.to_thread(self._diff, repo, commit1)
+
+                return {"diff": diff_result}
+
+            else:
+                raise ValueError(f"Unknown tool: {name}")
+
     def _setup_routes(self):
         @self.app.list_resources()
         async def list_resources() -> list[Resource]:
-            resources = []
-            for repo_path in self.repositories_dir.glob("*"):
-                if repo_path.is_dir() and (repo_path / ".git").exists():
-                    try:
-                        repo_name = repo_path.name
-                        self._validate_repo_name(repo_name)
-                        uri = AnyUrl(f"git://{repo_name}")
-                        resources.append(
-                            Resource(
-                                uri=uri,
-                                name=f"Git repository dir: {repo_path.absolute()}",
-                                mimeType="application/x-git",
-                                description=f"Local git repository at {repo_path}",
-                            )
-                        )
-                    except ValueError as e:
-                        logger.warning(f"Skipping invalid repository: {str(e)}")
-                        continue
-            return resources
+            prefix, pattern = self._resource_filters()
+            # ネットワークファイルシステム上では走査も確認も遅くなりうるため、まとめてスレッドで行う
+            return await asyncio.to_thread(self._list_repo_resources, prefix, pattern)
 
         @self.app.read_resource()
         async def read_resource(uri: AnyUrl) -> str:
-            if not str(uri).startswith("git://"):
+            import pygit2
+            from pygit2.enums import RepositoryOpenFlag
+
+            # AnyUrlは解析済みなので、文字列化せずにスキームとホストを参照する
+            if uri.scheme != _URI_SCHEME or uri.path:
                 raise ValueError(f"Unknown resource: {uri}")
 
-            repo_name = str(uri).split("://")[1]
-            repo_path = self._check_repository_exists(repo_name)
+            repo_name = uri.host
+            self._validate_repo_name(repo_name)
+            repo_path = os.path.join(self._repositories_dir_str, repo_name)
+
+            # 読み取り専用のパスはlibgit2でプロセス内から直接参照する
+            # 事前の存在確認は行わず、開けなかった場合をリポジトリなしとして扱う
+            try:
+                repo = pygit2.Repository(repo_path, RepositoryOpenFlag.NO_SEARCH)
+            except pygit2.GitError as e:
+                raise ValueError(f"Repository not found: {repo_name}") from e
 
             try:
-                repo = Repo(repo_path)
-                return json.dumps(
+                # HEADの参照解決とコミットの読み込みはそれぞれ一度だけ行う
+                head = repo.head
+                commit = head.peel(pygit2.Commit)
+                return _dump(
                     {
                         "name": repo_name,
-                        "active_branch": str(repo.active_branch),
+                        "active_branch": head.shorthand,
                         "last_commit": {
-                            "hash": str(repo.head.commit),
-                            "message": repo.head.commit.message,
-                            "author": str(repo.head.commit.author),
-                            "date": repo.head.commit.committed_datetime.isoformat(),
+                            "hash": str(commit.id),
+                            "message": commit.message,
+                            "author": commit.author.name,
+                            "date": datetime.fromtimestamp(
+                                commit.commit_time,
+                                timezone(timedelta(minutes=commit.commit_time_offset)),
+                            ),
                         },
                         "remotes": [
                             {"name": remote.name, "url": remote.url} for remote in repo.remotes
                         ],
-                    },
-                    indent=2,
+                    }
                 )
-            except GitCommandError as e:
+            except pygit2.GitError as e:
                 raise RuntimeError(f"Git error: {str(e)}")
 
         @self.app.list_tools()
         async def list_tools() -> list[Tool]:
-            return [
-                Tool(
-                    name="create_repository",
-                    description="Create a new git repository",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "name": {
-                                "type": "string",
-                                "description": "Repository name",
-                            },
-                            "init_commit": {
-                                "type": "boolean",
-                                "description": "Create initial commit",
-                                "default": True,
-                            },
-                            "remote_url": {
-                                "type": "string",
-                                "description": "Remote repository URL (optional)",
-                            },
-                        },
-                        "required": ["name"],
-                    },
-                ),
-                Tool(
-                    name="git_add",
-                    description="Add files to git staging area",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_name": {"type": "string", "description": "Repository name"},
-                            "files": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "List of files to add",
-                            },
-                        },
-                        "required": ["repo_name", "files"],
-                    },
-                ),
-                Tool(
-                    name="git_commit",
-                    description="Commit staged changes",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_name": {"type": "string", "description": "Repository name"},
-                            "message": {"type": "string", "description": "Commit message"},
-                        },
-                        "required": ["repo_name", "message"],
-                    },
-                ),
-                Tool(
-                    name="git_pull",
-                    description="Pull changes from remote repository",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_name": {"type": "string", "description": "Repository name"},
-                            "remote": {
-                                "type": "string",
-                                "description": "Remote name",
-                                "default": "origin",
-                            },
-                            "branch": {
-                                "type": "string",
-                                "description": "Branch name",
-                                "default": "main",
-                            },
-                        },
-                        "required": ["repo_name"],
-                    },
-                ),
-                Tool(
-                    name="git_push",
-                    description="Push changes to remote repository",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_name": {"type": "string", "description": "Repository name"},
-                            "remote": {
-                                "type": "string",
-                                "description": "Remote name",
-                                "default": "origin",
-                            },
-                            "branch": {
-                                "type": "string",
-                                "description": "Branch name",
-                                "default": "main",
-                            },
-                        },
-                        "required": ["repo_name"],
-                    },
-                ),
-                Tool(
-                    name="git_diff",
-                    description="Show differences between commits, commit and working tree, etc.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "repo_name": {"type": "string", "description": "Repository name"},
-                            "commit1": {
-                                "type": "string",
-                                "description": "First commit hash (optional, default is HEAD)",
-                                "default": "HEAD",
-                            },
-                            "commit2": {
-                                "type": "string",
-                                "description": "Second commit hash (optional)",
-                            },
-                        },
-                        "required": ["repo_name"],
-                    },
-                ),
-            ]
+            return _TOOLS
 
         @self.app.call_tool()
         async def call_tool(
             name: str, arguments: Any
         ) -> list[TextContent | ImageContent | EmbeddedResource]:
-            try:
-                if name == "create_repository":
-                    if not isinstance(arguments, dict) or "name" not in arguments:
-                        raise ValueError("Invalid repository creation arguments")
-
-                    repo_name = arguments["name"]
-                    self._validate_repo_name(repo_name)
-                    repo_path = self.repositories_dir / repo_name
-
-                    if repo_path.exists():
-                        raise ValueError(f"Repository already exists: {repo_name}")
-
-                    init_commit = arguments.get("init_commit", True)
-                    remote_url = arguments.get("remote_url")
-
-                    repo_path.mkdir(parents=True)
-                    repo = Repo.init(repo_path)
-
-                    if init_commit:
-                        # Create README.md
-                        readme_path = repo_path / "README.md"
-                        readme_path.write_text(
-                            f"# {repo_name}\n\nCreated on {datetime.now().isoformat()}"
-                        )
-
-                        # Initial commit
-                        repo.index.add(["README.md"])
-                        repo.index.commit("Initial commit")
-
-                    if remote_url:
-                        repo.create_remote("origin", remote_url)
-
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {
-                                    "status": "success",
-                                    "message": f"Repository '{repo_name}' created successfully",
-                                    "path": str(repo_path.absolute()),
-                                    "has_initial_commit": init_commit,
-                                    "remote_url": remote_url,
-                                },
-                                indent=2,
-                            ),
-                        )
-                    ]
-
-                # その他のGit操作の共通処理
-                repo_name = arguments["repo_name"]
-                repo_path = self._check_repository_exists(repo_name)
-                repo = Repo(repo_path)
-
-                if name == "git_add":
-                    files = arguments["files"]
-                    repo.index.add(files)
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {
-                                    "status": "success",
-                                    "message": f"Added files to staging area: {', '.join(files)}",
-                                    "repo": repo_name,
-                                },
-                                indent=2,
-                            ),
-                        )
-                    ]
-
-                elif name == "git_commit":
-                    message = arguments["message"]
-                    commit = repo.index.commit(message)
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {
-                                    "status": "success",
-                                    "message": "Commit created successfully",
-                                    "commit_hash": str(commit),
-                                    "commit_message": message,
-                                    "repo": repo_name,
-                                },
-                                indent=2,
-                            ),
-                        )
-                    ]
-
-                elif name == "git_pull":
-                    remote = arguments.get("remote", "origin")
-                    branch = arguments.get("branch", "main")
-                    remote_obj = repo.remote(name=remote)
-                    remote_obj.pull(branch)
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {
-                                    "status": "success",
-                                    "message": f"Pulled changes from {remote}/{branch}",
-                                    "repo": repo_name,
-                                },
-                                indent=2,
-                            ),
-                        )
-                    ]
-
-                elif name == "git_push":
-                    remote = arguments.get("remote", "origin")
-                    branch = arguments.get("branch", "main")
-                    remote_obj = repo.remote(name=remote)
-                    remote_obj.push(branch)
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {
-                                    "status": "success",
-                                    "message": f"Pushed changes to {remote}/{branch}",
-                                    "repo": repo_name,
-                                },
-                                indent=2,
-                            ),
-                        )
-                    ]
-
-                elif name == "git_diff":
-                    commit1 = arguments.get("commit1", "HEAD")
-                    commit2 = arguments.get("commit2")
-
-                    # diffコマンドの実行
-                    if commit2:
-                        diff_result = repo.git.diff(commit1, commit2)
-                    else:
-                        # コミット済みの変更とワーキングツリーの差分を表示
-                        diff_result = repo.git.diff(commit1)
-
-                    return [
-                        TextContent(type="text", text=json.dumps({"diff": diff_result}, indent=2))
-                    ]
-
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
+            from git.exc import GitCommandError
 
+            try:
+                result = await self._dispatch_tool(name, arguments)
+                # 差分は大きくなりやすく、整形しても読みやすくならないためインデントしない
+                return [_text(result, indent=name not in _COMPACT_TOOLS)]
             except GitCommandError as e:
                 logger.error(f"Git operation failed: {str(e)}")
                 raise RuntimeError(f"Git operation failed: {str(e)}")
-            except Exception as e:
-                logger.error(f"Operation failed: {str(e)}")
-                raise RuntimeError(f"Operation failed: {str(e)}")
+            except (ValueError, OSError):
+                # 入力検証エラーや存在しないファイルの指定は想定内なので、ログを出さずにそのまま返す
+                raise
+            except Exception:
+                logger.exception(f"Operation failed: {name}")
+                raise
 
     async def run(self):
         from mcp.server.stdio import stdio_server
 
-        async with stdio_server() as (read_stream, write_stream):
-            await self.app.run(read_stream, write_stream, self.app.create_initialization_options())
+        # Git操作はスレッドプールへ逃がすため、ネットワークIO待ちを考慮して多めに確保する
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=32))
+
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.app.run(
+                    read_stream, write_stream, self.app.create_initialization_options()
+                )
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        キャッシュ済みのRepoが保持している常駐gitプロセス（cat-file --batch）を終了する
+        """
+        for _, repo in self._repo_cache.values():
+            repo.close()
+        self._repo_cache.clear()
 
 
 async def main():
@@ -445,6 +949,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
+    # uvloopが利用可能であれば高速なイベントループを使う
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
 
     asyncio.run(main())
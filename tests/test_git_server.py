@@ -0,0 +1,292 @@
+import asyncio
+import shutil
+import subprocess
+
+import pytest
+from mcp import types
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+
+import git_server
+from git_server import GitServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = GitServer(str(tmp_path / "repositories"))
+    yield server
+    server.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_git_add_stages_every_file(server):
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "r"})
+        repo_path = server.repositories_dir / "r"
+        files = [f"f{i}.txt" for i in range(40)]
+        for f in files:
+            (repo_path / f).write_text(f)
+        await asyncio.gather(
+            *(server._dispatch_tool("git_add", {"repo_name": "r", "files": [f]}) for f in files)
+        )
+        return files
+
+    files = run(scenario())
+    repo = server._get_repo(server.repositories_dir / "r")
+    staged = {path for path, _ in repo.index.entries}
+    assert set(files) <= staged
+
+
+def test_evicted_repo_in_use_is_not_closed(server, monkeypatch):
+    monkeypatch.setattr(git_server, "_REPO_CACHE_SIZE", 1)
+
+    async def scenario():
+        for name in ("a", "b"):
+            await server._dispatch_tool("create_repository", {"name": name})
+        path_a = server.repositories_dir / "a"
+        path_b = server.repositories_dir / "b"
+        async with server._repo_lock(path_a):
+            repo_a = server._get_repo(path_a)
+            closed = []
+            monkeypatch.setattr(repo_a, "close", lambda: closed.append(True))
+            server._get_repo(path_b)
+            return closed
+
+    assert run(scenario()) == []
+
+
+def test_deleted_repository_is_reported_as_not_found(server):
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "r"})
+        await server._dispatch_tool("git_diff", {"repo_name": "r"})
+        shutil.rmtree(server.repositories_dir / "r")
+        with pytest.raises(ValueError, match="Repository not found: r"):
+            await server._dispatch_tool("git_diff", {"repo_name": "r"})
+        assert "r" not in server._known_repos
+
+    run(scenario())
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        {"op": "git_add", "args": {"files": "README.md"}},
+        {"op": "create_repository", "args": {"name": "x", "bare": "yes"}},
+        {"op": "no_such_tool", "args": {}},
+        {"op": "git_batch", "args": {"ops": []}},
+    ],
+)
+def test_batch_rejects_invalid_op_before_running_anything(server, op):
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "r"})
+        return await server._dispatch_tool(
+            "git_batch",
+            {"repo_name": "r", "ops": [{"op": "git_diff", "args": {}}, op]},
+        )
+
+    result = run(scenario())
+    assert result["status"] == "error"
+    assert result["failed_op"] == 1
+    assert result["op"] == op["op"]
+    assert result["results"] == []
+    assert not (server.repositories_dir / "x").exists()
+
+
+def test_batch_failure_returns_completed_results(server):
+    result = run(
+        server._dispatch_tool(
+            "git_batch",
+            {
+                "ops": [
+                    {"op": "create_repository", "args": {"name": "r"}},
+                    {"op": "git_add", "args": {"repo_name": "r", "files": ["missing.txt"]}},
+                ]
+            },
+        )
+    )
+    assert result["status"] == "error"
+    assert result["failed_op"] == 1
+    assert result["op"] == "git_add"
+    assert [r["op"] for r in result["results"]] == ["create_repository"]
+
+
+@pytest.mark.parametrize(
+    "tool, args",
+    [
+        ("git_pull", {"remote": "--upload-pack=touch {marker}; false"}),
+        ("git_push", {"remote": "--receive-pack=touch {marker}; false"}),
+        ("git_pull", {"branch": "--upload-pack=touch {marker}; false"}),
+        ("git_push", {"branch": "--receive-pack=touch {marker}; false"}),
+        ("git_diff", {"commit1": "--output={marker}"}),
+        ("git_diff", {"commit2": "--output={marker}"}),
+    ],
+)
+def test_option_injection_is_rejected(server, tmp_path, tool, args):
+    marker = tmp_path / "marker"
+    upstream = tmp_path / "upstream.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(upstream)], check=True)
+    args = {key: value.format(marker=marker) for key, value in args.items()}
+
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "r", "remote_url": str(upstream)})
+        with pytest.raises(ValueError):
+            await server._dispatch_tool(tool, {"repo_name": "r", **args})
+
+    run(scenario())
+    assert not marker.exists()
+
+
+def test_pull_and_push_use_registered_remote(server, tmp_path):
+    upstream = tmp_path / "upstream.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(upstream)], check=True)
+
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "r", "remote_url": str(upstream)})
+        await server._dispatch_tool("git_push", {"repo_name": "r"})
+        await server._dispatch_tool("git_pull", {"repo_name": "r"})
+        with pytest.raises(ValueError, match="Remote not found: nope"):
+            await server._dispatch_tool("git_push", {"repo_name": "r", "remote": "nope"})
+
+    run(scenario())
+
+
+def call_tool(server, name, arguments):
+    handler = server.app.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name=name, arguments=arguments),
+    )
+    return run(handler(request)).root
+
+
+def test_missing_argument_is_reported_clearly(server):
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "r"})
+        with pytest.raises(ValueError, match="^Missing required argument: message$"):
+            await server._dispatch_tool("git_commit", {"repo_name": "r"})
+
+    run(scenario())
+
+
+def test_missing_file_is_not_logged_as_crash(server, caplog):
+    run(server._dispatch_tool("create_repository", {"name": "r"}))
+    result = call_tool(server, "git_add", {"repo_name": "r", "files": ["missing.txt"]})
+    assert result.isError
+    assert "missing.txt" in result.content[0].text
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+
+def test_unexpected_key_error_is_logged_and_kept(server, monkeypatch, caplog):
+    async def broken(name, arguments):
+        raise KeyError("internal")
+
+    monkeypatch.setattr(server, "_dispatch_tool", broken)
+    result = call_tool(server, "git_diff", {"repo_name": "r"})
+    assert result.isError
+    assert result.content[0].text == "'internal'"
+    assert any(record.exc_info for record in caplog.records)
+
+
+def test_bare_repository_has_initial_commit_and_rejects_index_operations(server):
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "r", "bare": True})
+        for tool, args in [("git_add", {"files": ["README.md"]}), ("git_commit", {"message": "m"})]:
+            with pytest.raises(ValueError, match=f"Cannot run {tool} on bare repository: r"):
+                await server._dispatch_tool(tool, {"repo_name": "r", **args})
+
+    run(scenario())
+    repo = server._get_repo(server.repositories_dir / "r")
+    assert repo.bare
+    assert repo.active_branch.name == "main"
+    commit = repo.head.commit
+    assert commit.message == "Initial commit"
+    assert commit.tree["README.md"].data_stream.read().startswith(b"# r\n")
+
+
+@pytest.mark.parametrize("count", [3, git_server._BATCH_ADD_THRESHOLD + 4])
+def test_git_add_behaves_the_same_on_both_sides_of_batch_threshold(server, count):
+    repo_path = server.repositories_dir / "r"
+    files = [f"f{i}.log" for i in range(count)]
+
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "r"})
+        (repo_path / ".gitignore").write_text("*.log\n")
+        for f in files:
+            (repo_path / f).write_text(f)
+        await server._dispatch_tool("git_add", {"repo_name": "r", "files": files})
+
+        (repo_path / "README.md").unlink()
+        for missing in (["README.md"], ["missing.txt"]):
+            with pytest.raises(FileNotFoundError):
+                await server._dispatch_tool(
+                    "git_add", {"repo_name": "r", "files": files[1:] + missing}
+                )
+
+    run(scenario())
+    staged = {path for path, _ in server._get_repo(repo_path).index.entries}
+    assert set(files) <= staged
+    assert "README.md" in staged
+
+
+def test_listed_resources_are_readable(server):
+    for name in ("tmp", "proj.git"):
+        subprocess.run(["git", "init", "-q", str(server.repositories_dir / name)], check=True)
+    handlers = server.app.request_handlers
+
+    async def scenario():
+        await server._dispatch_tool("create_repository", {"name": "ok"})
+        listing = await handlers[types.ListResourcesRequest](
+            types.ListResourcesRequest(method="resources/list")
+        )
+        uris = [resource.uri for resource in listing.root.resources]
+        for uri in uris:
+            await handlers[types.ReadResourceRequest](
+                types.ReadResourceRequest(
+                    method="resources/read", params=types.ReadResourceRequestParams(uri=uri)
+                )
+            )
+        return uris
+
+    assert [str(uri) for uri in run(scenario())] == ["git://ok"]
+
+
+def list_resources_with_meta(server, meta):
+    handler = server.app.request_handlers[types.ListResourcesRequest]
+    token = request_ctx.set(
+        RequestContext(
+            request_id=1,
+            meta=types.RequestParams.Meta(**meta) if meta is not None else None,
+            session=None,
+            lifespan_context=None,
+        )
+    )
+    try:
+        result = run(handler(types.ListResourcesRequest(method="resources/list")))
+    finally:
+        request_ctx.reset(token)
+    return sorted(str(resource.uri) for resource in result.root.resources)
+
+
+@pytest.mark.parametrize(
+    "meta, expected",
+    [
+        (None, ["git://alpha", "git://alps", "git://beta"]),
+        ({"prefix": "al"}, ["git://alpha", "git://alps"]),
+        ({"pattern": "*ta"}, ["git://beta"]),
+        ({"prefix": "al", "pattern": "*s"}, ["git://alps"]),
+        ({"prefix": "zz"}, []),
+    ],
+)
+def test_list_resources_filters_by_meta(server, meta, expected):
+    for name in ("alpha", "alps", "beta"):
+        run(server._dispatch_tool("create_repository", {"name": name}))
+    assert list_resources_with_meta(server, meta) == expected
+
+
+@pytest.mark.parametrize("meta", [{"prefix": 3}, {"pattern": ["*"]}])
+def test_list_resources_rejects_non_string_filters(server, meta):
+    with pytest.raises(ValueError, match="must be strings"):
+        list_resources_with_meta(server, meta)